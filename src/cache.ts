@@ -3,6 +3,11 @@
  * Replicates the Python implementation's TTL-based caching
  */
 
+import crypto from 'crypto';
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+
 interface CacheEntry<T> {
   value: T;
   timestamp: number;
@@ -14,6 +19,7 @@ interface CacheConfig {
   modules: number;
   module_items: number;
   file_urls: number;
+  file_contents: number;
   assignments: number;
   gradescope_courses: number;
   gradescope_assignments: number;
@@ -26,22 +32,198 @@ const CACHE_TTL: CacheConfig = {
   modules: 1800,        // 30 minutes  
   module_items: 1800,   // 30 minutes
   file_urls: 3600,      // 1 hour
+  file_contents: 3600,  // 1 hour
   assignments: 1800,    // 30 minutes
   gradescope_courses: 3600,     // 1 hour
   gradescope_assignments: 1800, // 30 minutes
   gradescope_submissions: 1800  // 30 minutes
 };
 
+// Upper bound on entries per cache type; the least recently used entry is
+// evicted first, so an unbounded stream of file URLs can't grow memory forever
+const CACHE_MAX_ENTRIES = 256;
+
+// Snapshot location for persisting the cache across process restarts; MCP
+// servers are often spawned per client session, so a warm disk cache spares
+// each new process the cold first-call latency. Lives under the user's home
+// directory (not tmpdir) because the snapshot holds signed file URLs
+const PERSIST_PATH = process.env.CANVAS_MCP_CACHE_FILE ||
+  path.join(os.homedir(), '.canvas-mcp-cache.json');
+
+// The snapshot and tmp file are readable by the owning user only; signed
+// Canvas download URLs must not leak to other users on a shared host
+const PERSIST_FILE_MODE = 0o600;
+
+// Debounce between a cache update and the disk snapshot so bursts of sets
+// (e.g. module enrichment) produce one write
+const PERSIST_DELAY_MS = 1000;
+
+// Types excluded from the snapshot: module_items and file_contents carry
+// downloaded file bodies (megabytes of base64 per entry), so serializing
+// them can stall the event loop for seconds and overflow V8's string limit.
+// Only cheap-to-refetch metadata is persisted; content is re-downloaded on
+// demand and revalidated via the stored validators
+const SNAPSHOT_EXCLUDED_TYPES: ReadonlySet<keyof CacheConfig> =
+  new Set(['module_items', 'file_contents']);
+
+// On-disk snapshot shape: entries are tagged with a digest of the
+// credentials they were fetched under
+interface CacheSnapshot {
+  scope: string;
+  caches: Record<string, Record<string, CacheEntry<any>>>;
+}
+
 class Cache {
-  private storage: Map<string, CacheEntry<any>> = new Map();
+  private storage: Map<keyof CacheConfig, Map<string, CacheEntry<any>>> = new Map();
+  private persistTimer: NodeJS.Timeout | null = null;
+  private persistInFlight: boolean = false;
+  private persistAgain: boolean = false;
+  private lastSnapshotHash: string | null = null;
+  private scope: string | null = null;
+
+  /**
+   * Bind the cache to one credential scope (a digest of the base URL and
+   * API keys) and restore the last snapshot only when it was written under
+   * the same scope, so a credential change starts cold instead of replaying
+   * another account's data. Until a scope is bound, nothing is loaded or
+   * persisted; only the digest ever touches disk
+   */
+  bindScope(scopeKey: string): void {
+    const digest = crypto.createHash('sha256').update(scopeKey).digest('base64');
+    if (this.scope === digest) {
+      return;
+    }
+    if (this.scope !== null) {
+      // Re-bound with different credentials in the same process; the old
+      // account's entries must not survive into the new one
+      this.storage.clear();
+      this.lastSnapshotHash = null;
+    }
+    this.scope = digest;
+    this.loadFromDisk();
+  }
+
+  /**
+   * Restore still-valid entries from the last snapshot, if one exists and
+   * was written under the currently bound credential scope
+   * Best-effort: a missing or corrupt snapshot just means a cold start
+   */
+  private loadFromDisk(): void {
+    try {
+      if (!fs.existsSync(PERSIST_PATH)) {
+        return;
+      }
+
+      const snapshot = JSON.parse(fs.readFileSync(PERSIST_PATH, 'utf-8')) as CacheSnapshot;
+      if (snapshot.scope !== this.scope || !snapshot.caches) {
+        return;
+      }
+      const currentTime = Date.now() / 1000;
+
+      for (const [cacheType, entries] of Object.entries(snapshot.caches)) {
+        if (!(cacheType in CACHE_TTL) ||
+            SNAPSHOT_EXCLUDED_TYPES.has(cacheType as keyof CacheConfig)) {
+          continue;
+        }
+        const store = this.getTypeStore(cacheType as keyof CacheConfig);
+        for (const [key, entry] of Object.entries(entries)) {
+          if (currentTime - entry.timestamp <= entry.ttl) {
+            store.set(key, entry);
+          }
+        }
+      }
+    } catch {
+      // Ignore and start cold
+    }
+  }
+
+  /**
+   * Schedule a debounced snapshot write; the timer is unref'd so it never
+   * keeps the process alive
+   */
+  private schedulePersist(): void {
+    if (this.persistTimer) {
+      return;
+    }
+    this.persistTimer = setTimeout(() => {
+      this.persistTimer = null;
+      void this.persistToDisk();
+    }, PERSIST_DELAY_MS);
+    this.persistTimer.unref?.();
+  }
+
+  /**
+   * Write the current cache contents to the snapshot file
+   * Non-blocking (fs.promises) and atomic: the snapshot is written to a
+   * temp file and renamed into place, so a crash mid-write can never leave
+   * a truncated file for the next process to load
+   */
+  private async persistToDisk(): Promise<void> {
+    if (this.persistInFlight) {
+      // A write is already running; run one more pass when it finishes
+      this.persistAgain = true;
+      return;
+    }
+
+    this.persistInFlight = true;
+    try {
+      do {
+        this.persistAgain = false;
+        if (this.scope === null) {
+          // No credential scope bound yet; an untagged snapshot could be
+          // replayed into a differently-credentialed process
+          break;
+        }
+        const caches: Record<string, Record<string, CacheEntry<any>>> = {};
+        for (const [cacheType, store] of this.storage.entries()) {
+          if (SNAPSHOT_EXCLUDED_TYPES.has(cacheType)) {
+            continue;
+          }
+          caches[cacheType] = Object.fromEntries(store);
+        }
+        const snapshot: CacheSnapshot = { scope: this.scope, caches };
+        const json = JSON.stringify(snapshot);
+        // Only the digest is retained for the unchanged-content check, so
+        // the snapshot string itself can be released after the write
+        const hash = crypto.createHash('sha256').update(json).digest('base64');
+        if (hash === this.lastSnapshotHash) {
+          continue;
+        }
+        const tmpPath = `${PERSIST_PATH}.tmp`;
+        await fs.promises.writeFile(tmpPath, json, { mode: PERSIST_FILE_MODE });
+        await fs.promises.rename(tmpPath, PERSIST_PATH);
+        this.lastSnapshotHash = hash;
+      } while (this.persistAgain);
+    } catch {
+      // Persistence is best-effort; the in-memory cache still works
+    } finally {
+      this.persistInFlight = false;
+    }
+  }
+
+  /**
+   * Get (or lazily create) the store for one cache type
+   */
+  private getTypeStore(cacheType: keyof CacheConfig): Map<string, CacheEntry<any>> {
+    let store = this.storage.get(cacheType);
+    if (!store) {
+      store = new Map();
+      this.storage.set(cacheType, store);
+    }
+    return store;
+  }
 
   /**
    * Get an item from cache if it exists and is not expired
    */
   get<T>(cacheType: keyof CacheConfig, key?: string): T | null {
-    const cacheKey = key ? `${cacheType}_${key}` : cacheType;
-    const entry = this.storage.get(cacheKey);
-    
+    const store = this.storage.get(cacheType);
+    if (!store) {
+      return null;
+    }
+
+    const cacheKey = key ?? '';
+    const entry = store.get(cacheKey);
     if (!entry) {
       return null;
     }
@@ -49,10 +231,14 @@ class Cache {
     const currentTime = Date.now() / 1000; // Convert to seconds
     if (currentTime - entry.timestamp > entry.ttl) {
       // Entry has expired, remove it
-      this.storage.delete(cacheKey);
+      store.delete(cacheKey);
       return null;
     }
 
+    // Re-insert so Map iteration order tracks recency for LRU eviction
+    store.delete(cacheKey);
+    store.set(cacheKey, entry);
+
     return entry.value;
   }
 
@@ -60,15 +246,27 @@ class Cache {
    * Store an item in cache with current timestamp
    */
   set<T>(cacheType: keyof CacheConfig, value: T, key?: string): void {
-    const cacheKey = key ? `${cacheType}_${key}` : cacheType;
+    const store = this.getTypeStore(cacheType);
+    const cacheKey = key ?? '';
     const ttl = CACHE_TTL[cacheType];
     const timestamp = Date.now() / 1000; // Convert to seconds
 
-    this.storage.set(cacheKey, {
+    store.delete(cacheKey);
+    store.set(cacheKey, {
       value,
       timestamp,
       ttl
     });
+
+    if (store.size > CACHE_MAX_ENTRIES) {
+      // Oldest (least recently used) entry is first in insertion order
+      const oldestKey = store.keys().next().value;
+      if (oldestKey !== undefined) {
+        store.delete(oldestKey);
+      }
+    }
+
+    this.schedulePersist();
   }
 
   /**
@@ -76,21 +274,15 @@ class Cache {
    */
   clear(): void {
     this.storage.clear();
+    this.schedulePersist();
   }
 
   /**
    * Clear specific cache type
    */
   clearType(cacheType: keyof CacheConfig): void {
-    const keysToDelete: string[] = [];
-    
-    for (const key of this.storage.keys()) {
-      if (key.startsWith(cacheType)) {
-        keysToDelete.push(key);
-      }
-    }
-    
-    keysToDelete.forEach(key => this.storage.delete(key));
+    this.storage.delete(cacheType);
+    this.schedulePersist();
   }
 
   /**
@@ -98,14 +290,15 @@ class Cache {
    */
   getStats(): { totalEntries: number; cacheTypes: Record<string, number> } {
     const cacheTypes: Record<string, number> = {};
-    
-    for (const key of this.storage.keys()) {
-      const type = key.split('_')[0];
-      cacheTypes[type] = (cacheTypes[type] || 0) + 1;
+    let totalEntries = 0;
+
+    for (const [cacheType, store] of this.storage.entries()) {
+      cacheTypes[cacheType] = store.size;
+      totalEntries += store.size;
     }
 
     return {
-      totalEntries: this.storage.size,
+      totalEntries,
       cacheTypes
     };
   }
@@ -3,7 +3,10 @@
  * Replicates all functionality from the Python canvas.py implementation
  */
 
+import http from 'http';
+import https from 'https';
 import fetch from 'node-fetch';
+import type { RequestInit, Response } from 'node-fetch';
 import { cache } from './cache.js';
 import { Logger } from './config.js';
 
@@ -84,45 +87,322 @@ interface FileData {
   content_type?: string;
   url?: string;
   download_url?: string;
+  updated_at?: string;
+}
+
+// Downloaded file content cached alongside the validator (updated_at or
+// size) it was fetched under, so unchanged files are never re-downloaded
+interface FileContentCacheEntry {
+  validator: string;
+  content: Pick<ModuleItem,
+    'file_content_text' | 'file_content_base64' | 'file_content_type' |
+    'file_content_size' | 'file_content_truncated' | 'is_public_link'>;
 }
 
 const MAX_CONTENT_BYTES = 5 * 1024 * 1024; // 5 MB cap to avoid huge downloads
 
+// Shared keep-alive agents so repeated Canvas calls reuse TCP+TLS connections
+// instead of paying a fresh handshake on every request
+const httpAgent = new http.Agent({ keepAlive: true, maxSockets: 32 });
+const httpsAgent = new https.Agent({ keepAlive: true, maxSockets: 32 });
+const selectAgent = (url: URL) => (url.protocol === 'http:' ? httpAgent : httpsAgent);
+
+// Transient statuses worth retrying with backoff (rate limits, gateway errors)
+const RETRY_STATUS_CODES = new Set([429, 500, 502, 503, 504]);
+const MAX_RETRIES = 2;
+const RETRY_BACKOFF_MS = 300;
+
+// How many file enrichments to run at once; kept below the pool size so a
+// big module cannot monopolize the connection pool or trip rate limits
+const ENRICH_CONCURRENCY = 8;
+
+// How many ETag validators (plus their last response body) to keep around
+// for conditional GETs
+const ETAG_STORE_MAX = 256;
+
+// Background prefetch runs at low concurrency so speculative work never
+// crowds out requests the client is actually waiting on
+const PREFETCH_CONCURRENCY = 2;
+
+// How many additional result pages to fetch in parallel once rel="last"
+// reveals how many there are
+const PAGINATION_CONCURRENCY = 4;
+
+const sleep = (ms: number) => new Promise<void>(resolve => setTimeout(resolve, ms));
+
+// Global cap on simultaneous Canvas requests across all tools; anything
+// beyond this queues instead of piling onto the API and triggering 429s
+const REQUEST_CONCURRENCY = 12;
+
+/**
+ * Minimal counting semaphore for bounding concurrent requests
+ */
+class Semaphore {
+  private available: number;
+  private waiters: Array<() => void> = [];
+
+  constructor(limit: number) {
+    this.available = limit;
+  }
+
+  async acquire(): Promise<void> {
+    if (this.available > 0) {
+      this.available--;
+      return;
+    }
+    await new Promise<void>(resolve => this.waiters.push(resolve));
+  }
+
+  release(): void {
+    const next = this.waiters.shift();
+    if (next) {
+      next();
+    } else {
+      this.available++;
+    }
+  }
+}
+
+const requestSemaphore = new Semaphore(REQUEST_CONCURRENCY);
+
+// Field projection applied to every assignment; hoisted to module level so
+// the callback is created once, not per call (itemgetter-style specialization)
+const projectAssignment = (assignment: Assignment): Assignment => ({
+  id: assignment.id,
+  name: assignment.name,
+  description: assignment.description,
+  due_at: assignment.due_at,
+  has_submitted_submissions: assignment.has_submitted_submissions
+});
+
+/**
+ * Run an async task over every element with at most `limit` tasks in flight
+ */
+async function mapWithConcurrency<T>(
+  items: T[],
+  limit: number,
+  task: (item: T) => Promise<void>
+): Promise<void> {
+  if (items.length === 0) {
+    return;
+  }
+
+  let nextIndex = 0;
+  const worker = async (): Promise<void> => {
+    while (nextIndex < items.length) {
+      await task(items[nextIndex++]);
+    }
+  };
+
+  await Promise.all(
+    Array.from({ length: Math.min(limit, items.length) }, () => worker())
+  );
+}
+
+/**
+ * Parse a Canvas Link header into a rel -> URL map
+ */
+function parseLinkHeader(linkHeader: string | null): Record<string, string> {
+  const rels: Record<string, string> = {};
+  if (!linkHeader) {
+    return rels;
+  }
+  for (const part of linkHeader.split(',')) {
+    const [urlPart, ...relParts] = part.split(';');
+    const rel = relParts.map(p => p.trim()).find(p => p.startsWith('rel='));
+    if (rel) {
+      rels[rel.slice(4).replace(/"/g, '')] = urlPart.trim().replace(/^</, '').replace(/>$/, '');
+    }
+  }
+  return rels;
+}
+
+interface CourseNameEntry {
+  name: string;
+  id: number;
+  tokenSet: Set<string>;
+}
+
+interface CourseNameIndex {
+  source: Record<string, number>;
+  byLowerName: Map<string, number>;
+  byToken: Map<string, CourseNameEntry[]>;
+  entries: CourseNameEntry[];
+}
+
+// Matches below this score are treated as "course not found" rather than
+// risking assignments from an unrelated course; overlap on generic words
+// alone ("introduction", "spring") must never clear it
+const COURSE_MATCH_THRESHOLD = 0.5;
+
+// A score this high cannot be meaningfully beaten, so scanning can stop
+const COURSE_MATCH_EARLY_EXIT = 0.95;
+
+// Tokens shorter than this ("to", "of", "and") say nothing about which
+// course is meant and are excluded from overlap scoring; short course codes
+// like "cse 310" still match through the substring band
+const MIN_MATCH_TOKEN_LENGTH = 4;
+
+const tokenize = (value: string): string[] =>
+  value.split(/[^a-z0-9]+/).filter(token => token.length >= MIN_MATCH_TOKEN_LENGTH);
+
+/**
+ * Score how well a lowercase query matches a lowercase course name:
+ * 1 for an exact match, just below that for substring containment
+ * (favoring tighter names), then Dice-style token overlap
+ */
+function scoreCourseMatch(needle: string, needleTokens: string[], name: string, nameTokenSet: Set<string>): number {
+  if (name === needle) {
+    return 1;
+  }
+  if (name.includes(needle)) {
+    return 0.8 + 0.2 * (needle.length / name.length);
+  }
+  if (needleTokens.length === 0 || nameTokenSet.size === 0) {
+    return 0;
+  }
+
+  let common = 0;
+  for (const token of needleTokens) {
+    if (nameTokenSet.has(token)) {
+      common++;
+    }
+  }
+  return (0.8 * 2 * common) / (needleTokens.length + nameTokenSet.size);
+}
+
 export class CanvasApi {
   private config: CanvasApiConfig;
+  private courseNameIndex: CourseNameIndex | null = null;
+  private etagStore: Map<string, { etag: string; body: unknown; nextUrl: string | null; lastUrl: string | null }> = new Map();
+  private inflight: Map<string, Promise<unknown>> = new Map();
+  private baseHeaders: Record<string, string>;
+  private baseUrl: URL;
 
   constructor(config: CanvasApiConfig) {
     this.config = config;
+    // Built once: the auth header never changes for the lifetime of the client
+    this.baseHeaders = {
+      'Authorization': `Bearer ${config.apiKey}`,
+      'Accept': 'application/json',
+      'User-Agent': 'Canvas-MCP-JS/1.0'
+    };
+    // Parsed once so per-request URL building only parses the endpoint path
+    this.baseUrl = new URL(config.baseUrl);
   }
 
   /**
-   * Make a GET request to Canvas API with authentication
+   * Build (and memoize) a lowercase name -> id index over the courses map,
+   * so by-name lookups don't re-lowercase every course on every call
    */
-  private async makeRequest<T>(endpoint: string, params?: Record<string, string>): Promise<T | null> {
+  private getCourseNameIndex(courses: Record<string, number>): CourseNameIndex {
+    if (!this.courseNameIndex || this.courseNameIndex.source !== courses) {
+      const byLowerName = new Map<string, number>();
+      const byToken = new Map<string, CourseNameEntry[]>();
+      const entries: CourseNameEntry[] = [];
+      for (const [name, id] of Object.entries(courses)) {
+        const lowerName = name.toLowerCase();
+        byLowerName.set(lowerName, id);
+        // Tokenized once here so match scoring never re-splits names per query
+        const entry: CourseNameEntry = { name: lowerName, id, tokenSet: new Set(tokenize(lowerName)) };
+        entries.push(entry);
+        // Inverted token index: token -> courses containing it
+        for (const token of entry.tokenSet) {
+          const bucket = byToken.get(token);
+          if (bucket) {
+            bucket.push(entry);
+          } else {
+            byToken.set(token, [entry]);
+          }
+        }
+      }
+      this.courseNameIndex = { source: courses, byLowerName, byToken, entries };
+    }
+    return this.courseNameIndex;
+  }
+
+  /**
+   * Perform a fetch over the shared keep-alive agents, retrying transient
+   * failures (429/5xx and network errors) with exponential backoff
+   */
+  private async fetchWithRetry(url: URL | string, init: RequestInit = {}, timeoutMs: number = 10000): Promise<Response> {
+    await requestSemaphore.acquire();
     try {
-      const url = new URL(endpoint, this.config.baseUrl);
-      if (params) {
-        Object.entries(params).forEach(([key, value]) => {
-          url.searchParams.append(key, value);
-        });
+      for (let attempt = 0; ; attempt++) {
+        const controller = new AbortController();
+        const timeoutId = setTimeout(() => controller.abort(), timeoutMs);
+
+        try {
+          const response = await fetch(url, {
+            agent: selectAgent,
+            ...init,
+            signal: controller.signal
+          });
+
+          if (RETRY_STATUS_CODES.has(response.status) && attempt < MAX_RETRIES) {
+            // The discarded body must be torn down, or its keep-alive socket
+            // stays checked out of the agent pool for the process lifetime
+            response.body?.destroy();
+            this.config.logger.warn(`Retrying request after status ${response.status}:`, String(url));
+            await sleep(RETRY_BACKOFF_MS * 2 ** attempt);
+            continue;
+          }
+
+          return response;
+        } catch (error) {
+          if (attempt < MAX_RETRIES) {
+            this.config.logger.warn('Retrying request after network error:', error);
+            await sleep(RETRY_BACKOFF_MS * 2 ** attempt);
+            continue;
+          }
+          throw error;
+        } finally {
+          clearTimeout(timeoutId);
+        }
       }
+    } finally {
+      requestSemaphore.release();
+    }
+  }
 
-      this.config.logger.debug(`Making Canvas API request to: ${url}`);
+  /**
+   * Build a full Canvas API URL from an endpoint and query params
+   */
+  private buildUrl(endpoint: string, params?: Record<string, string>): URL {
+    const url = new URL(endpoint, this.baseUrl);
+    if (params) {
+      Object.entries(params).forEach(([key, value]) => {
+        url.searchParams.append(key, value);
+      });
+    }
+    return url;
+  }
+
+  /**
+   * Fetch and parse a single Canvas API page, returning the body together
+   * with the rel="next" pagination link (null when this is the last page)
+   */
+  private async fetchPage<T>(url: URL | string): Promise<{ body: T; nextUrl: string | null; lastUrl: string | null } | null> {
+    try {
+      this.config.logger.debug('Making Canvas API request to:', String(url));
+
+      const urlKey = url.toString();
+      const validated = this.etagStore.get(urlKey);
 
-      const controller = new AbortController();
-      const timeoutId = setTimeout(() => controller.abort(), 10000);
-      
-      const response = await fetch(url, {
+      const headers = validated
+        ? { ...this.baseHeaders, 'If-None-Match': validated.etag }
+        : this.baseHeaders;
+
+      const response = await this.fetchWithRetry(url, {
         method: 'GET',
-        headers: {
-          'Authorization': `Bearer ${this.config.apiKey}`,
-          'Accept': 'application/json',
-          'User-Agent': 'Canvas-MCP-JS/1.0'
-        },
-        signal: controller.signal
+        headers
       });
 
-      clearTimeout(timeoutId);
+      // Conditional GET hit: the resource is unchanged, reuse the stored body
+      if (response.status === 304 && validated) {
+        this.config.logger.debug('Canvas responded 304 Not Modified for:', String(url));
+        return { body: validated.body as T, nextUrl: validated.nextUrl, lastUrl: validated.lastUrl };
+      }
 
       if (!response.ok) {
         this.config.logger.error(`Canvas API error: ${response.status} ${response.statusText}`);
@@ -131,17 +411,127 @@ export class CanvasApi {
         return null;
       }
 
-      return await response.json() as T;
+      const body = await response.json() as T;
+      const links = parseLinkHeader(response.headers.get('link'));
+      const nextUrl = links['next'] ?? null;
+      const lastUrl = links['last'] ?? null;
+
+      // Remember the validator so the next refresh of this URL can be a
+      // zero-byte 304 instead of a full transfer
+      const etag = response.headers.get('etag');
+      if (etag) {
+        this.etagStore.delete(urlKey);
+        this.etagStore.set(urlKey, { etag, body, nextUrl, lastUrl });
+        if (this.etagStore.size > ETAG_STORE_MAX) {
+          const oldestKey = this.etagStore.keys().next().value;
+          if (oldestKey !== undefined) {
+            this.etagStore.delete(oldestKey);
+          }
+        }
+      }
+
+      return { body, nextUrl, lastUrl };
     } catch (error) {
       this.config.logger.error(`Canvas API request failed:`, error);
       return null;
     }
   }
 
+  /**
+   * Make a GET request to Canvas API with authentication
+   */
+  private async makeRequest<T>(endpoint: string, params?: Record<string, string>): Promise<T | null> {
+    const page = await this.fetchPage<T>(this.buildUrl(endpoint, params));
+    return page ? page.body : null;
+  }
+
+  /**
+   * Make a GET request to a paginated Canvas list endpoint, following
+   * Link rel="next" headers so results beyond the first page aren't
+   * silently dropped
+   */
+  private async makePaginatedRequest<T>(endpoint: string, params?: Record<string, string>): Promise<T[] | null> {
+    let page = await this.fetchPage<T[]>(this.buildUrl(endpoint, params));
+    if (!page || !Array.isArray(page.body)) {
+      return page ? (page.body as T[]) : null;
+    }
+
+    const results = [...page.body];
+    if (!page.nextUrl) {
+      return results;
+    }
+
+    // When rel="last" names the final page, the remaining page URLs are
+    // derivable up front, so pages 2..N can be fetched concurrently instead
+    // of walking next links one round trip at a time
+    const lastUrl = page.lastUrl ? new URL(page.lastUrl) : null;
+    const lastPage = lastUrl ? parseInt(lastUrl.searchParams.get('page') || '') : NaN;
+
+    if (lastUrl && !isNaN(lastPage) && lastPage > 1) {
+      const pageNumbers = Array.from({ length: lastPage - 1 }, (_, i) => i + 2);
+      const pages: Array<T[] | undefined> = new Array(pageNumbers.length);
+
+      await mapWithConcurrency(pageNumbers, PAGINATION_CONCURRENCY, async pageNumber => {
+        const pageUrl = new URL(lastUrl.toString());
+        pageUrl.searchParams.set('page', String(pageNumber));
+        const fetched = await this.fetchPage<T[]>(pageUrl);
+        if (fetched && Array.isArray(fetched.body)) {
+          pages[pageNumber - 2] = fetched.body;
+        }
+      });
+
+      for (let i = 0; i < pages.length; i++) {
+        const body = pages[i];
+        if (!body) {
+          // Keep results contiguous: stop at the first failed page
+          this.config.logger.warn(`Pagination stopped early at page ${i + 2} of: ${endpoint}`);
+          break;
+        }
+        results.push(...body);
+      }
+      return results;
+    }
+
+    // Fallback: walk next links sequentially when no rel="last" is offered
+    while (page.nextUrl) {
+      const next = await this.fetchPage<T[]>(page.nextUrl);
+      if (!next || !Array.isArray(next.body)) {
+        // Return what we have rather than failing the whole call
+        this.config.logger.warn(`Pagination stopped early at: ${page.nextUrl}`);
+        break;
+      }
+      results.push(...next.body);
+      page = next;
+    }
+    return results;
+  }
+
+  /**
+   * Deduplicate concurrent calls for the same resource: while a fetch is in
+   * flight, later callers share its promise instead of racing an identical
+   * request (the cache-stampede guard from the prefetch/user-call overlap)
+   */
+  private dedupe<T>(key: string, fetcher: () => Promise<T>): Promise<T> {
+    const pending = this.inflight.get(key);
+    if (pending) {
+      return pending as Promise<T>;
+    }
+
+    const promise = fetcher().finally(() => {
+      this.inflight.delete(key);
+    });
+    this.inflight.set(key, promise);
+    return promise;
+  }
+
   /**
    * Get all available Canvas courses for the current user
    */
   async getCourses(): Promise<Record<string, number> | null> {
+    return this.dedupe('courses', () => this.fetchCourses());
+  }
+
+  private async fetchCourses(): Promise<Record<string, number> | null> {
     // Check cache first
     const cached = cache.get<Record<string, number>>('courses');
     if (cached) {
@@ -150,8 +540,7 @@ export class CanvasApi {
     }
 
     try {
-      const courses = await this.makeRequest<Course[]>('/api/v1/courses', {
-        page: '1',
+      const courses = await this.makePaginatedRequest<Course>('/api/v1/courses', {
         per_page: '100'
       });
 
@@ -174,7 +563,7 @@ export class CanvasApi {
 
       // Store in cache
       cache.set('courses', coursesMap);
-      this.config.logger.debug(`Cached ${Object.keys(coursesMap).length} courses`);
+      this.config.logger.debug('Cached courses:', Object.keys(coursesMap).length);
 
       return coursesMap;
     } catch (error) {
@@ -187,17 +576,23 @@ export class CanvasApi {
    * Get all modules within a specific Canvas course
    */
   async getModules(courseId: string | number): Promise<Module[] | null> {
+    return this.dedupe(`modules_${courseId}`, () => this.fetchModules(courseId));
+  }
+
+  private async fetchModules(courseId: string | number): Promise<Module[] | null> {
     const courseIdStr = String(courseId);
-    
+
     // Check cache first
     const cached = cache.get<Module[]>('modules', courseIdStr);
     if (cached) {
-      this.config.logger.debug(`Using cached modules data for course ${courseId}`);
+      this.config.logger.debug('Using cached modules data for course', courseId);
       return cached;
     }
 
     try {
-      const modules = await this.makeRequest<Module[]>(`/api/v1/courses/${courseId}/modules`);
+      const modules = await this.makePaginatedRequest<Module>(`/api/v1/courses/${courseId}/modules`, {
+        per_page: '100'
+      });
 
       if (!modules) {
         this.config.logger.error(`Failed to fetch modules for course ${courseId}`);
@@ -211,7 +606,11 @@ export class CanvasApi {
 
       // Store in cache
       cache.set('modules', modules, courseIdStr);
-      this.config.logger.debug(`Cached ${modules.length} modules for course ${courseId}`);
+      this.config.logger.debug('Cached', modules.length, 'modules for course', courseId);
+
+      // Clients that list modules almost always drill into some of them next;
+      // start warming the module_items cache without delaying this response
+      this.prefetchModuleItems(courseIdStr, modules);
 
       return modules;
     } catch (error) {
@@ -220,24 +619,76 @@ export class CanvasApi {
     }
   }
 
+  /**
+   * Speculatively warm the item listings (via the ETag store) and the
+   * file URL cache for a course's modules. File content is deliberately
+   * not downloaded here: that can run to megabytes per file across every
+   * module, and the client may never open most of them. A later real
+   * getModuleItems call still pays enrichment, but against warm URLs,
+   * validators, and keep-alive connections
+   * Fire-and-forget: failures are logged and never surface to the caller
+   */
+  private prefetchModuleItems(courseId: string, modules: Module[]): void {
+    mapWithConcurrency(modules, PREFETCH_CONCURRENCY, async module => {
+      if (cache.get<ModuleItem[]>('module_items', `${courseId}_${module.id}`)) {
+        return;
+      }
+
+      // A real getModuleItems call is already fetching (and enriching) this
+      // module; warming it again would only duplicate its requests
+      if (this.inflight.has(`module_items_${courseId}_${module.id}`)) {
+        return;
+      }
+
+      const items = await this.fetchModuleItemsListing(courseId, module.id);
+      if (!items) {
+        return;
+      }
+
+      const fileItems = items.filter(item => item.type === 'File' && item.content_id);
+      await mapWithConcurrency(fileItems, PREFETCH_CONCURRENCY, async item => {
+        await this.resolveFileUrl(courseId, item.content_id!);
+      });
+    }).catch(error => {
+      this.config.logger.debug('Module items prefetch failed:', error);
+    });
+  }
+
+  /**
+   * Fetch the raw items listing for a module, shared through the in-flight
+   * registry so the background prefetch and a real call racing on the same
+   * module issue one set of page requests between them
+   */
+  private fetchModuleItemsListing(
+    courseId: string | number,
+    moduleId: string | number
+  ): Promise<ModuleItem[] | null> {
+    return this.dedupe(`module_items_list_${courseId}_${moduleId}`, () =>
+      this.makePaginatedRequest<ModuleItem>(
+        `/api/v1/courses/${courseId}/modules/${moduleId}/items`,
+        { per_page: '100' }
+      ));
+  }
+
   /**
    * Get all items within a specific module, with file content enrichment
    */
   async getModuleItems(courseId: string | number, moduleId: string | number): Promise<ModuleItem[] | null> {
+    return this.dedupe(`module_items_${courseId}_${moduleId}`, () => this.fetchModuleItems(courseId, moduleId));
+  }
+
+  private async fetchModuleItems(courseId: string | number, moduleId: string | number): Promise<ModuleItem[] | null> {
     const cacheKey = `${courseId}_${moduleId}`;
-    
+
     // Check cache first
     const cached = cache.get<ModuleItem[]>('module_items', cacheKey);
     if (cached) {
-      this.config.logger.debug(`Using cached module items for module ${moduleId} in course ${courseId}`);
+      this.config.logger.debug('Using cached module items for module', moduleId, 'in course', courseId);
       return cached;
     }
 
     try {
-      const items = await this.makeRequest<ModuleItem[]>(
-        `/api/v1/courses/${courseId}/modules/${moduleId}/items`,
-        { per_page: '100' }
-      );
+      const items = await this.fetchModuleItemsListing(courseId, moduleId);
 
       if (!items) {
         this.config.logger.error(`Failed to fetch module items for module ${moduleId} in course ${courseId}`);
@@ -254,7 +705,7 @@ export class CanvasApi {
 
       // Store in cache
       cache.set('module_items', items, cacheKey);
-      this.config.logger.debug(`Cached ${items.length} module items for module ${moduleId}`);
+      this.config.logger.debug('Cached', items.length, 'module items for module', moduleId);
 
       return items;
     } catch (error) {
@@ -265,46 +716,97 @@ export class CanvasApi {
 
   /**
    * Enrich file-type module items with download URLs and content
+   * Files are processed concurrently (bounded to respect Canvas rate limits);
+   * workers share the keep-alive connection pool
    */
   private async enrichFileItems(items: ModuleItem[], courseId: string): Promise<void> {
-    for (const item of items) {
-      if (item.type === 'File' && item.content_id) {
-        try {
-          const fileId = item.content_id;
-          
-          // Get file URL (with cache)
-          const fileCacheKey = `${courseId}_${fileId}`;
-          let fileUrl = cache.get<string>('file_urls', fileCacheKey);
-
-          if (!fileUrl) {
-            const fileData = await this.makeRequest<FileData>(`/api/v1/courses/${courseId}/files/${fileId}`);
-            if (fileData) {
-              fileUrl = fileData.url || fileData.download_url || null;
-              
-              // Attach minimal metadata
-              item.file_meta = {
-                display_name: fileData.display_name,
-                filename: fileData.filename,
-                size: fileData.size,
-                content_type: fileData['content-type'] || fileData.content_type
-              };
-
-              if (fileUrl) {
-                cache.set('file_urls', fileUrl, fileCacheKey);
-              }
-            }
-          }
+    const fileItems = items.filter(item => item.type === 'File' && item.content_id);
+    await mapWithConcurrency(fileItems, ENRICH_CONCURRENCY, item => this.enrichFileItem(item, courseId));
+  }
 
-          if (fileUrl) {
-            item.file_url = fileUrl;
-            
-            // Try to download file content
-            await this.downloadFileContent(item, fileUrl);
-          }
-        } catch (error) {
-          this.config.logger.warn(`Failed to enrich file item ${item.id}:`, error);
+  /**
+   * Fetch file metadata and resolve the direct download URL, caching the URL
+   * The metadata is only non-null when it was freshly fetched (cache miss)
+   */
+  private resolveFileUrl(
+    courseId: string | number,
+    fileId: string | number
+  ): Promise<{ fileUrl: string | null; fileData: FileData | null }> {
+    const cacheKey = `${courseId}_${fileId}`;
+
+    // Deduped so the prefetch and an enrichment racing on the same file
+    // share one metadata request instead of issuing duplicates
+    return this.dedupe(`file_url_${cacheKey}`, async () => {
+      const cached = cache.get<string>('file_urls', cacheKey);
+      if (cached) {
+        this.config.logger.debug('Using cached file URL for file', fileId, 'in course', courseId);
+        return { fileUrl: cached, fileData: null };
+      }
+
+      const fileData = await this.makeRequest<FileData>(`/api/v1/courses/${courseId}/files/${fileId}`);
+      if (!fileData) {
+        return { fileUrl: null, fileData: null };
+      }
+
+      const fileUrl = fileData.url || fileData.download_url || null;
+      if (fileUrl) {
+        cache.set('file_urls', fileUrl, cacheKey);
+      }
+
+      return { fileUrl, fileData };
+    });
+  }
+
+  /**
+   * Enrich a single file-type module item with its download URL and content
+   */
+  private async enrichFileItem(item: ModuleItem, courseId: string): Promise<void> {
+    try {
+      const fileId = item.content_id!;
+      const fileCacheKey = `${courseId}_${fileId}`;
+
+      const { fileUrl, fileData } = await this.resolveFileUrl(courseId, fileId);
+
+      if (fileData) {
+        // Attach minimal metadata
+        item.file_meta = {
+          display_name: fileData.display_name,
+          filename: fileData.filename,
+          size: fileData.size,
+          content_type: fileData['content-type'] || fileData.content_type
+        };
+      }
+
+      if (fileUrl) {
+        item.file_url = fileUrl;
+
+        // Reuse previously downloaded content when the file is unchanged;
+        // without fresh metadata the TTL alone decides
+        const validator = fileData ? (fileData.updated_at || String(fileData.size ?? '')) : '';
+        const cachedContent = cache.get<FileContentCacheEntry>('file_contents', fileCacheKey);
+        if (cachedContent && (!validator || cachedContent.validator === validator)) {
+          this.config.logger.debug('Using cached file content for file', fileId);
+          Object.assign(item, cachedContent.content);
+          return;
         }
+
+        // Try to download file content
+        await this.downloadFileContent(item, fileUrl);
+
+        cache.set<FileContentCacheEntry>('file_contents', {
+          validator,
+          content: {
+            file_content_text: item.file_content_text,
+            file_content_base64: item.file_content_base64,
+            file_content_type: item.file_content_type,
+            file_content_size: item.file_content_size,
+            file_content_truncated: item.file_content_truncated,
+            is_public_link: item.is_public_link
+          }
+        }, fileCacheKey);
       }
+    } catch (error) {
+      this.config.logger.warn(`Failed to enrich file item ${item.id}:`, error);
     }
   }
 
@@ -314,79 +816,84 @@ export class CanvasApi {
    */
   private async downloadFileContent(item: ModuleItem, fileUrl: string): Promise<void> {
     try {
-      // First try HEAD request to check content type and size
-      const headController = new AbortController();
-      const headTimeoutId = setTimeout(() => headController.abort(), 10000);
-      
-      const headResponse = await fetch(fileUrl, { 
-        method: 'HEAD',
-        signal: headController.signal
-      });
-      
-      clearTimeout(headTimeoutId);
-
-      let contentType = '';
-      if (headResponse.ok) {
-        contentType = headResponse.headers.get('content-type') || '';
-        
-        // For PDFs, just provide the public URL instead of downloading content
-        if (contentType === 'application/pdf' || fileUrl.toLowerCase().endsWith('.pdf')) {
-          item.file_content_type = contentType || 'application/pdf';
-          item.file_url = fileUrl;
-          item.file_content_truncated = false;
-          // Add a flag to indicate this is a public link
-          item.is_public_link = true;
-          this.config.logger.debug(`Providing public link for PDF: ${fileUrl}`);
-          return;
-        }
+      // Single ranged GET instead of the old HEAD-then-GET pair: the Range
+      // header caps the transfer server-side when honored, and content type
+      // is available from the response headers before the body is consumed
+      const response = await this.fetchWithRetry(fileUrl, {
+        headers: { 'Range': `bytes=0-${MAX_CONTENT_BYTES - 1}` }
+      }, 20000);
 
-        const contentLength = headResponse.headers.get('content-length');
-        if (contentLength && parseInt(contentLength) > MAX_CONTENT_BYTES) {
-          item.file_content_truncated = true;
-          return;
-        }
-      }
-
-      // GET the content for non-PDF files
-      const downloadController = new AbortController();
-      const downloadTimeoutId = setTimeout(() => downloadController.abort(), 20000);
-      
-      const response = await fetch(fileUrl, { 
-        signal: downloadController.signal
-      });
-      
-      clearTimeout(downloadTimeoutId);
       if (!response.ok) {
         this.config.logger.warn(`Could not download file content, status ${response.status}`);
         return;
       }
 
-      const buffer = await response.buffer();
-      contentType = response.headers.get('content-type') || contentType;
-      
-      item.file_content_type = contentType;
-      item.file_content_size = buffer.length;
+      let contentType = response.headers.get('content-type') || '';
 
-      if (buffer.length > MAX_CONTENT_BYTES) {
-        item.file_content_truncated = true;
-        // Keep first MAX_CONTENT_BYTES bytes
-        const truncatedBuffer = buffer.slice(0, MAX_CONTENT_BYTES);
-        item.file_content_base64 = truncatedBuffer.toString('base64');
-      } else {
+      // For PDFs, just provide the public URL instead of downloading content
+      if (contentType.startsWith('application/pdf') || fileUrl.toLowerCase().endsWith('.pdf')) {
+        response.body?.destroy();
+        item.file_content_type = contentType || 'application/pdf';
+        item.file_url = fileUrl;
         item.file_content_truncated = false;
-        item.file_content_base64 = buffer.toString('base64');
+        // Add a flag to indicate this is a public link
+        item.is_public_link = true;
+        this.config.logger.debug('Providing public link for PDF:', fileUrl);
+        return;
       }
 
-      // If text-like, also provide decoded text
-      if (contentType.startsWith('text/') || 
-          contentType.includes('application/json') || 
-          contentType.includes('application/xml')) {
+      // Stream the body and stop reading once the cap is reached, so an
+      // oversized file never occupies more than MAX_CONTENT_BYTES of memory
+      const chunks: Buffer[] = [];
+      let received = 0;
+      let truncated = false;
+
+      if (response.body) {
+        for await (const chunk of response.body as AsyncIterable<Buffer | Uint8Array>) {
+          const data = Buffer.isBuffer(chunk) ? chunk : Buffer.from(chunk);
+          if (received + data.length > MAX_CONTENT_BYTES) {
+            chunks.push(data.slice(0, MAX_CONTENT_BYTES - received));
+            received = MAX_CONTENT_BYTES;
+            truncated = true;
+            // Breaking out destroys the stream and aborts the rest of the download
+            break;
+          }
+          chunks.push(data);
+          received += data.length;
+        }
+      }
+
+      // A 206 partial response reports the full size in Content-Range, so a
+      // file the server already capped for us is still flagged as truncated
+      const contentRange = response.headers.get('content-range');
+      if (contentRange) {
+        const totalSize = parseInt(contentRange.split('/')[1]);
+        if (!isNaN(totalSize) && totalSize > MAX_CONTENT_BYTES) {
+          truncated = true;
+        }
+      }
+
+      const buffer = Buffer.concat(chunks);
+
+      item.file_content_type = contentType;
+      item.file_content_size = buffer.length;
+      item.file_content_truncated = truncated;
+
+      // Text-like content is returned as decoded text only; shipping the
+      // same bytes again as base64 would grow the payload by another 133%
+      const isTextLike = contentType.startsWith('text/') ||
+          contentType.includes('application/json') ||
+          contentType.includes('application/xml');
+
+      if (isTextLike) {
         try {
-          const text = buffer.toString('utf-8');
-          item.file_content_text = text;
+          item.file_content_text = buffer.toString('utf-8');
         } catch (error) {
           this.config.logger.warn('Failed to decode file as text:', error);
+          item.file_content_base64 = buffer.toString('base64');
         }
+      } else {
+        item.file_content_base64 = buffer.toString('base64');
       }
     } catch (error) {
       this.config.logger.warn('Failed to download file content:', error);
@@ -397,31 +904,13 @@ export class CanvasApi {
    * Get direct download URL for a file stored in Canvas
    */
   async getFileUrl(courseId: string | number, fileId: string | number): Promise<string | null> {
-    const cacheKey = `${courseId}_${fileId}`;
-    
-    // Check cache first
-    const cached = cache.get<string>('file_urls', cacheKey);
-    if (cached) {
-      this.config.logger.debug(`Using cached file URL for file ${fileId} in course ${courseId}`);
-      return cached;
-    }
-
     try {
-      const fileData = await this.makeRequest<FileData>(`/api/v1/courses/${courseId}/files/${fileId}`);
-
-      if (!fileData) {
-        this.config.logger.error(`Failed to fetch file URL for file ${fileId}`);
-        return null;
-      }
+      const { fileUrl } = await this.resolveFileUrl(courseId, fileId);
 
-      const fileUrl = fileData.url;
       if (!fileUrl) {
         this.config.logger.warn(`No URL found in file data for file ${fileId}`);
-        return null;
       }
 
-      // Store in cache
-      cache.set('file_urls', fileUrl, cacheKey);
       return fileUrl;
     } catch (error) {
       this.config.logger.error('Unexpected error in getFileUrl:', error);
@@ -436,17 +925,19 @@ export class CanvasApi {
     const courseIdStr = String(courseId);
     
     try {
+      // No include[] params: the projection below only keeps standard
+      // assignment fields, so asking Canvas for submission/all_dates data
+      // just inflates the payload we immediately throw away
       const params: Record<string, string> = {
         order_by: 'due_at',
-        per_page: '100',
-        'include[]': JSON.stringify(['submission', 'all_dates'])
+        per_page: '100'
       };
 
       if (bucket) {
         params.bucket = bucket;
       }
 
-      const assignments = await this.makeRequest<Assignment[]>(
+      const assignments = await this.makePaginatedRequest<Assignment>(
         `/api/v1/courses/${courseId}/assignments`,
         params
       );
@@ -456,14 +947,15 @@ export class CanvasApi {
         return null;
       }
 
+      // Canvas reports errors as a JSON object rather than a list; guard so
+      // the projection below cannot blow up on an unexpected shape
+      if (!Array.isArray(assignments)) {
+        this.config.logger.error(`Unexpected assignments response for course ${courseId}:`, assignments);
+        return null;
+      }
+
       // Return simplified assignment data (matching Python implementation)
-      return assignments.map(assignment => ({
-        id: assignment.id,
-        name: assignment.name,
-        description: assignment.description,
-        due_at: assignment.due_at,
-        has_submitted_submissions: assignment.has_submitted_submissions
-      }));
+      return assignments.map(projectAssignment);
     } catch (error) {
       this.config.logger.error('Unexpected error in getCourseAssignments:', error);
       return null;
@@ -482,12 +974,58 @@ export class CanvasApi {
         return null;
       }
 
-      // Find the course ID by name (partial match)
-      let courseId: number | null = null;
-      for (const [name, id] of Object.entries(courses)) {
-        if (name.toLowerCase().includes(courseName.toLowerCase())) {
-          courseId = id;
-          break;
+      // Exact (case-insensitive) match is O(1) via the memoized index;
+      // otherwise pick the best-scoring course instead of the first
+      // substring hit, so "CSE 310" finds the right section even when an
+      // earlier course name happens to contain the query
+      const index = this.getCourseNameIndex(courses);
+      const needle = courseName.toLowerCase();
+
+      let courseId: number | null = index.byLowerName.get(needle) ?? null;
+      if (courseId === null) {
+        const needleTokens = tokenize(needle);
+        let bestScore = 0;
+
+        // Score token-sharing candidates first via the inverted index;
+        // usually a handful of courses instead of the whole list
+        const candidates = new Set<CourseNameEntry>();
+        for (const token of needleTokens) {
+          const bucket = index.byToken.get(token);
+          if (bucket) {
+            bucket.forEach(entry => candidates.add(entry));
+          }
+        }
+        for (const entry of candidates) {
+          const score = scoreCourseMatch(needle, needleTokens, entry.name, entry.tokenSet);
+          if (score > bestScore) {
+            bestScore = score;
+            courseId = entry.id;
+            if (bestScore >= COURSE_MATCH_EARLY_EXIT) {
+              break;
+            }
+          }
+        }
+
+        // Substring containment can match without sharing a whole token
+        // (e.g. "algo" inside "algorithms"), so sweep the rest only while
+        // no substring-grade match has been found among the candidates
+        if (bestScore < 0.8) {
+          for (const entry of index.entries) {
+            if (candidates.has(entry)) {
+              continue;
+            }
+            const score = scoreCourseMatch(needle, needleTokens, entry.name, entry.tokenSet);
+            if (score > bestScore) {
+              bestScore = score;
+              courseId = entry.id;
+              if (bestScore >= COURSE_MATCH_EARLY_EXIT) {
+                break;
+              }
+            }
+          }
+        }
+        if (bestScore < COURSE_MATCH_THRESHOLD) {
+          courseId = null;
         }
       }
 
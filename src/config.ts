@@ -20,10 +20,17 @@ export const configSchema = z.object({
 
 export type Config = z.infer<typeof configSchema>;
 
+// Memoized result of getConfig; env vars don't change while the process runs
+let cachedConfig: Config | null = null;
+
 /**
  * Get configuration from environment variables
  */
 export function getConfig(): Config {
+  if (cachedConfig) {
+    return cachedConfig;
+  }
+
   const config = {
     debug: process.env.DEBUG === 'true',
     canvasApiKey: process.env.CANVAS_API_KEY || '',
@@ -32,12 +39,14 @@ export function getConfig(): Config {
     gradescopePassword: process.env.GRADESCOPE_PASSWORD
   };
 
-  // Validate required fields
+  // Validate required fields; fail fast so the missing key is reported once
+  // instead of on every Canvas call
   if (!config.canvasApiKey) {
     throw new Error('CANVAS_API_KEY environment variable is required');
   }
 
-  return configSchema.parse(config);
+  cachedConfig = configSchema.parse(config);
+  return cachedConfig;
 }
 
 /**
@@ -50,10 +50,48 @@ interface GradescopeQueryAnalysis {
   confidence: number;
 }
 
+// Query-routing patterns, compiled once at module load; a single regex pass
+// over the query replaces one substring scan per keyword
+const COURSE_QUERY_RE = /my courses|list courses|show courses|what courses/;
+const ASSIGNMENT_QUERY_RE = /assignments|homework|due dates/;
+const SUBMISSION_QUERY_RE = /submission|submitted|grade|feedback|score/;
+
+interface CourseNameEntry {
+  nameLower: string;
+  fullNameLower: string;
+  course: GradescopeCourse;
+}
+
+interface CourseNameLookup {
+  byLowerName: Map<string, GradescopeCourse>;
+  entries: CourseNameEntry[];
+  misses: Set<string>;
+}
+
+interface AssignmentNameEntry {
+  nameLower: string;
+  assignment: GradescopeAssignment;
+}
+
+interface AssignmentNameLookup {
+  entries: AssignmentNameEntry[];
+  misses: Set<string>;
+}
+
+// Cap on remembered failed lookups per index, so a stream of unique bad
+// names can't grow the miss set unboundedly
+const NAME_MISS_CACHE_MAX = 128;
+
 export class GradescopeApi {
   private config: GradescopeConfig;
   private sessionCookies: string = '';
   private isAuthenticated: boolean = false;
+  private authPromise: Promise<boolean> | null = null;
+
+  // Lowercased name indexes, keyed by the cached object's identity so they
+  // rebuild automatically whenever the underlying cache entry refreshes
+  private courseNameIndex = new WeakMap<object, CourseNameLookup>();
+  private assignmentNameIndex = new WeakMap<object, AssignmentNameLookup>();
 
   constructor(config: GradescopeConfig) {
     this.config = config;
@@ -69,6 +107,17 @@ export class GradescopeApi {
       return true;
     }
 
+    // Concurrent tool calls share one login attempt instead of each paying
+    // auth latency (and risking rate limits) separately
+    if (!this.authPromise) {
+      this.authPromise = this.performAuthentication().finally(() => {
+        this.authPromise = null;
+      });
+    }
+    return this.authPromise;
+  }
+
+  private async performAuthentication(): Promise<boolean> {
     try {
       this.config.logger.debug('Attempting Gradescope authentication...');
       
@@ -111,9 +160,11 @@ export class GradescopeApi {
       // Mock implementation - replace with actual API calls
       this.config.logger.warn('Returning mock Gradescope courses data');
       
+      // Keyed by the raw course id so id lookups are a single property
+      // access instead of a scan over "Course ID: ..." display keys
       const mockCourses = {
         student: {
-          "Course ID: 123456": {
+          "123456": {
             id: "123456",
             name: "Computer Science 101",
             full_name: "Introduction to Computer Science",
@@ -122,7 +173,7 @@ export class GradescopeApi {
             num_grades_published: 5,
             num_assignments: 8
           },
-          "Course ID: 789012": {
+          "789012": {
             id: "789012", 
             name: "Data Structures",
             full_name: "Data Structures and Algorithms",
@@ -153,11 +204,46 @@ export class GradescopeApi {
       return null;
     }
 
-    for (const course of Object.values(courses.student)) {
-      if (course.name.toLowerCase().includes(courseName.toLowerCase()) ||
-          (course.full_name && course.full_name.toLowerCase().includes(courseName.toLowerCase()))) {
-        return course;
+    let lookup = this.courseNameIndex.get(courses);
+    if (!lookup) {
+      const entries = Object.values(courses.student).map(course => ({
+        nameLower: course.name.toLowerCase(),
+        fullNameLower: (course.full_name || '').toLowerCase(),
+        course
+      }));
+      const byLowerName = new Map<string, GradescopeCourse>();
+      for (const entry of entries) {
+        byLowerName.set(entry.nameLower, entry.course);
+        if (entry.fullNameLower) {
+          byLowerName.set(entry.fullNameLower, entry.course);
+        }
       }
+      lookup = { byLowerName, entries, misses: new Set() };
+      this.courseNameIndex.set(courses, lookup);
+    }
+
+    const needle = courseName.toLowerCase();
+
+    // Exact-name hit returns without scanning at all
+    const exact = lookup.byLowerName.get(needle);
+    if (exact) {
+      return exact;
+    }
+
+    // A name that already failed against this course list fails again
+    if (lookup.misses.has(needle)) {
+      return null;
+    }
+
+    for (const entry of lookup.entries) {
+      if (entry.nameLower.includes(needle) ||
+          (entry.fullNameLower && entry.fullNameLower.includes(needle))) {
+        return entry.course;
+      }
+    }
+
+    if (lookup.misses.size < NAME_MISS_CACHE_MAX) {
+      lookup.misses.add(needle);
     }
     return null;
   }
@@ -169,7 +255,7 @@ export class GradescopeApi {
     // Check cache first
     const cached = cache.get<GradescopeAssignment[]>('gradescope_assignments', courseId);
     if (cached) {
-      this.config.logger.debug(`Using cached Gradescope assignments for course ${courseId}`);
+      this.config.logger.debug('Using cached Gradescope assignments for course', courseId);
       return cached;
     }
 
@@ -217,11 +303,32 @@ export class GradescopeApi {
       return null;
     }
 
-    for (const assignment of assignments) {
-      if (assignment.name.toLowerCase().includes(assignmentName.toLowerCase())) {
-        return assignment;
+    let lookup = this.assignmentNameIndex.get(assignments);
+    if (!lookup) {
+      lookup = {
+        entries: assignments.map(assignment => ({
+          nameLower: assignment.name.toLowerCase(),
+          assignment
+        })),
+        misses: new Set()
+      };
+      this.assignmentNameIndex.set(assignments, lookup);
+    }
+
+    const needle = assignmentName.toLowerCase();
+    if (lookup.misses.has(needle)) {
+      return null;
+    }
+
+    for (const entry of lookup.entries) {
+      if (entry.nameLower.includes(needle)) {
+        return entry.assignment;
       }
     }
+
+    if (lookup.misses.size < NAME_MISS_CACHE_MAX) {
+      lookup.misses.add(needle);
+    }
     return null;
   }
 
@@ -234,7 +341,7 @@ export class GradescopeApi {
     // Check cache first
     const cached = cache.get<GradescopeSubmission[]>('gradescope_submissions', cacheKey);
     if (cached) {
-      this.config.logger.debug(`Using cached submissions for assignment ${assignmentId}`);
+      this.config.logger.debug('Using cached submissions for assignment', assignmentId);
       return cached;
     }
 
@@ -311,23 +418,21 @@ export class GradescopeApi {
     const queryLower = query.toLowerCase();
 
     // Check for courses request
-    if (['my courses', 'list courses', 'show courses', 'what courses'].some(keyword => 
-        queryLower.includes(keyword))) {
+    if (COURSE_QUERY_RE.test(queryLower)) {
       result.type = 'get_courses';
       result.confidence = 0.9;
       return result;
     }
 
     // Check for assignments request
-    if (['assignments', 'homework', 'due dates'].some(keyword => queryLower.includes(keyword))) {
+    if (ASSIGNMENT_QUERY_RE.test(queryLower)) {
       result.type = 'get_assignments';
       result.confidence = 0.8;
       return result;
     }
 
     // Check for submission request
-    if (['submission', 'submitted', 'grade', 'feedback', 'score'].some(keyword => 
-        queryLower.includes(keyword))) {
+    if (SUBMISSION_QUERY_RE.test(queryLower)) {
       result.type = 'get_submission';
       result.confidence = 0.7;
       return result;
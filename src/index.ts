@@ -26,6 +26,16 @@ export default function createStatelessServer({
 
   // Initialize logger and APIs
   const logger = new Logger(config.debug);
+
+  // Scope the persistent cache to these credentials so a server started
+  // against a different account or Canvas instance never replays another
+  // scope's snapshot
+  cache.bindScope([
+    config.canvasBaseUrl,
+    config.canvasApiKey,
+    config.gradescopeEmail ?? ''
+  ].join('\n'));
+
   const canvasApi = new CanvasApi({
     apiKey: config.canvasApiKey,
     baseUrl: config.canvasBaseUrl,
@@ -55,7 +65,7 @@ export default function createStatelessServer({
         return {
           content: [{ 
             type: "text", 
-            text: courses ? JSON.stringify(courses, null, 2) : "Failed to retrieve courses"
+            text: courses ? JSON.stringify(courses) : "Failed to retrieve courses"
           }]
         };
       } catch (error) {
@@ -80,7 +90,7 @@ export default function createStatelessServer({
         return {
           content: [{ 
             type: "text", 
-            text: modules ? JSON.stringify(modules, null, 2) : "Failed to retrieve modules"
+            text: modules ? JSON.stringify(modules) : "Failed to retrieve modules"
           }]
         };
       } catch (error) {
@@ -106,7 +116,7 @@ export default function createStatelessServer({
         return {
           content: [{ 
             type: "text", 
-            text: items ? JSON.stringify(items, null, 2) : "Failed to retrieve module items"
+            text: items ? JSON.stringify(items) : "Failed to retrieve module items"
           }]
         };
       } catch (error) {
@@ -156,9 +166,13 @@ export default function createStatelessServer({
       try {
         const assignments = await canvasApi.getCourseAssignments(course_id, bucket);
         return {
-          content: [{ 
-            type: "text", 
-            text: assignments ? JSON.stringify(assignments, null, 2) : "Failed to retrieve assignments"
+          content: [{
+            type: "text",
+            // An empty list is a real answer, not a failure; keep it
+            // distinguishable from a blank response
+            text: assignments
+              ? (assignments.length ? assignments.map(a => JSON.stringify(a)).join("\n") : "No assignments found")
+              : "Failed to retrieve assignments"
           }]
         };
       } catch (error) {
@@ -182,9 +196,11 @@ export default function createStatelessServer({
       try {
         const assignments = await canvasApi.getAssignmentsByCourseName(course_name, bucket);
         return {
-          content: [{ 
-            type: "text", 
-            text: assignments ? JSON.stringify(assignments, null, 2) : "Failed to retrieve assignments"
+          content: [{
+            type: "text",
+            text: assignments
+              ? (assignments.length ? assignments.map(a => JSON.stringify(a)).join("\n") : "No assignments found")
+              : "Failed to retrieve assignments"
           }]
         };
       } catch (error) {
@@ -207,7 +223,7 @@ export default function createStatelessServer({
         return {
           content: [{ 
             type: "text", 
-            text: courses ? JSON.stringify(courses, null, 2) : "Failed to retrieve courses"
+            text: courses ? JSON.stringify(courses) : "Failed to retrieve courses"
           }]
         };
       } catch (error) {
@@ -219,10 +235,56 @@ export default function createStatelessServer({
     }
   );
 
+  // Tool 8: Search across education platforms
+  server.tool(
+    "search_education_platforms",
+    "Use this tool to search for information across both Canvas and Gradescope using a natural language query. This tool returns matching Canvas courses and, when Gradescope credentials are configured, Gradescope results as well. Use this when you're not sure which platform holds the information being asked about.",
+    {
+      query: z.string().describe("Natural language query to search for")
+    },
+    async ({ query }) => {
+      try {
+        // Query both platforms concurrently; neither branch waits on the other
+        const [courses, gradescopeResults] = await Promise.all([
+          canvasApi.getCourses(),
+          gradescopeApi ? gradescopeApi.searchGradescope(query) : Promise.resolve(null)
+        ]);
+
+        // Narrow Canvas courses to ones mentioned by the query; fall back to
+        // the full list so the client can still pick a course itself
+        const queryLower = query.toLowerCase();
+        const canvasMatches: Record<string, number> = {};
+        if (courses) {
+          for (const [name, id] of Object.entries(courses)) {
+            if (queryLower.includes(name.toLowerCase()) || name.toLowerCase().includes(queryLower)) {
+              canvasMatches[name] = id;
+            }
+          }
+        }
+
+        const results = {
+          canvas: {
+            matching_courses: Object.keys(canvasMatches).length > 0 ? canvasMatches : courses
+          },
+          gradescope: gradescopeResults ?? { error: "Gradescope credentials not configured" }
+        };
+
+        return {
+          content: [{ type: "text", text: JSON.stringify(results) }]
+        };
+      } catch (error) {
+        logger.error("Error in search_education_platforms:", error);
+        return {
+          content: [{ type: "text", text: "Error searching education platforms" }]
+        };
+      }
+    }
+  );
+
   // ==== GRADESCOPE API TOOLS ====
 
   if (gradescopeApi) {
-    // Tool 8: Get Gradescope courses
+    // Tool 9: Get Gradescope courses
     server.tool(
       "get_gradescope_courses",
       "Use this tool to retrieve all available Gradescope courses for the current user. This tool returns a dictionary of courses organized by user role. Use this when helping users access or manage their Gradescope course information.",
@@ -232,7 +294,7 @@ export default function createStatelessServer({
           return {
             content: [{ 
               type: "text", 
-              text: courses ? JSON.stringify(courses, null, 2) : "Failed to retrieve Gradescope courses"
+              text: courses ? JSON.stringify(courses) : "Failed to retrieve Gradescope courses"
             }]
           };
         } catch (error) {